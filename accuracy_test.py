@@ -1,5 +1,32 @@
 import scipy.integrate as integrate
 import matplotlib.pyplot as plt
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def _reference_value(func, a, b):
+    """
+    Computes the reference value of an integral using SciPy, cached so each integral is only computed once.
+    """
+    if len(a) == 1:
+        return integrate.quad(func=func, a=a[0], b=b[0])[0]
+    return integrate.nquad(func=func, ranges=list(zip(a, b)))[0]
+
+
+def reference_value(integrator):
+    """
+    Function to find the value of an integral using SciPy, to compare the integration methods against.
+
+    Parameters
+    ----------
+    integrator:
+        The instance of the Integrator class
+
+    Returns
+    -------
+    The SciPy estimate for the integral.
+    """
+    return _reference_value(integrator.func, tuple(integrator.a), tuple(integrator.b))
 
 
 def error_div_dependence(integrator, integrator_method, divs, plot=False):
@@ -21,7 +48,7 @@ def error_div_dependence(integrator, integrator_method, divs, plot=False):
     -------
     An array of the errors for each subdivision number tested.
     """
-    actual_value = integrate.quad(func=integrator.func, a=integrator.a[0], b=integrator.b[0])[0]
+    actual_value = reference_value(integrator)
     errors = []
     for n in divs:
         result = integrator_method(n)
@@ -33,6 +60,46 @@ def error_div_dependence(integrator, integrator_method, divs, plot=False):
     return errors
 
 
+def error_div_dependence_batch(integrators, divs, plot=False):
+    """
+    Function to test the dependence of error on the number of subdivisions for the 1D composite midpoint method,
+    for several functions integrated over the same bounds at once.
+
+    Parameters
+    ----------
+    integrators:
+        List of instances of the Integrator class. These must all have the same bounds.
+    divs:
+        Array of the subdivision numbers to be used.
+    plot:
+        True/False. Choose whether the results are plotted.
+
+    Returns
+    -------
+    A list containing an array of the errors for each integrator, for each subdivision number tested.
+    """
+    if not integrators:
+        return []
+    a, b = tuple(integrators[0].a), tuple(integrators[0].b)
+    for integrator in integrators:
+        if tuple(integrator.a) != a or tuple(integrator.b) != b:
+            raise ValueError("All the integrators must have the same bounds to share a grid.")
+    funcs = [integrator.func for integrator in integrators]
+    actual_values = [reference_value(integrator) for integrator in integrators]
+    errors = [[] for _ in integrators]
+    for n in divs:
+        # The grid is built once for each subdivision number and shared by all the functions
+        results = integrators[0].batch_composite_midpoint(n, funcs)
+        for j in range(len(integrators)):
+            errors[j].append(abs(results[j] - actual_values[j]) / actual_values[j])
+
+    if plot:
+        for integrator_errors in errors:
+            plt.plot(divs, integrator_errors)
+        plt.show()
+    return errors
+
+
 def error_div_dependence_nd(integrator, integrator_method, divs, plot=False):
     """
     Function to test the dependence of error on the number of subdivisions for N-dim integration methods.
@@ -52,15 +119,12 @@ def error_div_dependence_nd(integrator, integrator_method, divs, plot=False):
     -------
     An array of the errors for each subdivision number tested.
     """
-    ranges = []
-    for i in range(len(integrator.a)):
-        ranges.append((integrator.a[i], integrator.b[i]))
-    actual_value = integrate.nquad(func=integrator.func, ranges=ranges)
+    actual_value = reference_value(integrator)
 
     errors = []
     for n in divs:
         result = integrator_method(n)
-        errors.append(abs(result - actual_value[0])/actual_value[0])
+        errors.append(abs(result - actual_value)/actual_value)
 
     if plot:
         plt.plot(divs, errors)
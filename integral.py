@@ -1,5 +1,105 @@
+import math
 import numpy as np
-import random
+from scipy.stats import qmc
+from jit import jit, jitted, prange
+
+
+@jit(cache=False)
+def _midpoint_kernel(a, h, n, func):
+    """
+    Compiled composite midpoint rule, used when the function to be integrated is itself compiled.
+    """
+    integral = 0.0
+    for i in range(n):
+        integral += func(a + (i + 0.5) * h)
+    return h * integral
+
+
+@jit(cache=False)
+def _simpsons_kernel(a, h, n, func):
+    """
+    Compiled composite Simpson's rule, used when the function to be integrated is itself compiled.
+    """
+    integral = 0.0
+    f_left = func(a)
+    for i in range(n):
+        left = a + i * h
+        f_right = func(left + h)
+        integral += f_left + 4 * func(left + h / 2) + f_right
+        f_left = f_right
+    return h / 6 * integral
+
+
+@jit(parallel=True, cache=False)
+def _monte_carlo_kernel(a, b, n, func):
+    """
+    Compiled Monte Carlo method, sampling in parallel with an independent random stream for each thread.
+    """
+    total = 0.0
+    for i in prange(n):
+        total += func(a + (b - a) * np.random.random())
+    return total * (b - a) / n
+
+
+def _evaluate(func, shape, *points):
+    """
+    Evaluates a function at arrays of points, giving an array of the given shape. The result is only broadcast if the
+    function returned a different shape, so functions that don't depend on every argument (such as a constant) still
+    give one value for each point.
+    """
+    values = func(*points)
+    if np.shape(values) != shape:
+        values = np.broadcast_to(values, shape)
+    return values
+
+
+_grid_kernels = {}
+
+
+def _grid_kernel(dimension_number):
+    """
+    Generates a compiled kernel for the n-dimensional methods with one nested loop for each dimension, used when the
+    function to be integrated is compiled. The kernel returns the weighted sum of the function over a grid with the
+    given number of points in each dimension, where the weight of each point is the product of its 1D weights.
+    Kernels are generated once for each number of dimensions and then reused.
+    """
+    if dimension_number not in _grid_kernels:
+        lines = ["def kernel(a, h, points, offset, weights, func):", "    total = 0.0"]
+        for i in range(dimension_number):
+            indent = "    " * (i + 1)
+            lines.append(f"{indent}for i{i} in range(points):")
+            lines.append(f"{indent}    x{i} = a[{i}] + (i{i} + offset) * h[{i}]")
+            lines.append(f"{indent}    w{i} = " + (f"w{i - 1} * " if i > 0 else "") + f"weights[i{i}]")
+        coords = ", ".join(f"x{i}" for i in range(dimension_number))
+        lines.append("    " * (dimension_number + 1) + f"total += w{dimension_number - 1} * func({coords})")
+        lines.append("    return total")
+        namespace = {}
+        exec("\n".join(lines), namespace)
+        _grid_kernels[dimension_number] = jit(namespace["kernel"], cache=False)
+    return _grid_kernels[dimension_number]
+
+
+_monte_carlo_kernels = {}
+
+
+def _monte_carlo_n_dim_kernel(dimension_number):
+    """
+    Generates a compiled Monte Carlo kernel for the given number of dimensions, used when the function to be
+    integrated is compiled. Samples are drawn in parallel with an independent random stream for each thread, and the
+    kernel returns the mean of the function over the samples. Kernels are generated once for each number of
+    dimensions and then reused.
+    """
+    if dimension_number not in _monte_carlo_kernels:
+        lines = ["def kernel(a, widths, n, func):", "    total = 0.0", "    for i in prange(n):"]
+        for i in range(dimension_number):
+            lines.append(f"        x{i} = a[{i}] + widths[{i}] * np.random.random()")
+        coords = ", ".join(f"x{i}" for i in range(dimension_number))
+        lines.append(f"        total += func({coords})")
+        lines.append("    return total / n")
+        namespace = {"np": np, "prange": prange}
+        exec("\n".join(lines), namespace)
+        _monte_carlo_kernels[dimension_number] = jit(namespace["kernel"], parallel=True, cache=False)
+    return _monte_carlo_kernels[dimension_number]
 
 
 class Integral:
@@ -19,8 +119,12 @@ class Integral:
     -------
     composite_midpoint(n):
         Approximates integral using the composite midpoint rule.
+    batch_composite_midpoint(n, funcs):
+        Uses the composite midpoint rule to estimate the integrals of several functions over the same bounds.
     composite_midpoint_adaptive(e, limit):
         Uses the composite midpoint rule adaptively to reach the desired precision.
+    romberg(e, levels):
+        Uses Richardson extrapolation of the trapezoidal rule to reach the desired precision.
     composite_midpoint_n_dim(n):
         Uses composite midpoint rule generalised to n dimensions.
     simpsons(n):
@@ -29,11 +133,20 @@ class Integral:
         Adaptively uses Simpsons to estimate the integral with a desired precision efficiently.
     simpsons_n_dim(n):
         Composite Simpsons rule generalised to n dimensions.
+    gauss_legendre(k):
+        Estimates integral using Gauss-Legendre quadrature.
     monte_carlo(n):
         Estimates integral using the Monte Carlo method.
     monte_carlo_n_dim(n):
         Monte Carlo method generalised to n dimensions.
+    quasi_monte_carlo(n):
+        Estimates integral using the quasi-Monte Carlo method.
+    quasi_monte_carlo_n_dim(n):
+        Quasi-Monte Carlo method generalised to n dimensions.
     """
+    # Gauss-Legendre nodes and weights on [-1, 1], shared by all instances so they are only computed once for each k
+    _legendre_nodes = {}
+
     def __init__(self, func, a, b):
         """
         Initialises the integral class for a given function and integration bounds.
@@ -77,14 +190,39 @@ class Integral:
 
         # division_width = (self.b - self.a) / n  # width for each rectangle
         division_width = self.width / n  # reducing the calculations slightly for adaptive method
-        integral = 0
-        left = self.a[0]  # the lower bound of the first rectangle
-        for i in range(0, n):
-            # upper bound of the rectangle is found by adding the division width to the lower bound
-            right = left + division_width
-            integral += division_width * self.func((left + right) / 2)
-            left = right  # sets the upper bound to be the lower bound of the next rectangle
-        return integral
+        if jitted(self.func):
+            return _midpoint_kernel(float(self.a[0]), division_width, n, self.func)
+        # midpoints of every rectangle, evaluated in a single call to the function
+        midpoints = self.a[0] + (np.arange(n) + 0.5) * division_width
+        return division_width * np.sum(_evaluate(self.func, midpoints.shape, midpoints))
+
+    def batch_composite_midpoint(self, n, funcs):
+        """
+        Uses the composite midpoint rule to estimate the integrals of several functions over the same bounds.
+        Parameters
+        ----------
+        n : int
+            Number of subdivisions
+        funcs : list
+            The functions to be integrated, each using the bounds of this instance.
+
+        Returns
+        -------
+        A list of the estimates for the integral of each function.
+        """
+        division_width = self.width / n
+        midpoints = None
+        results = []
+        for func in funcs:
+            if jitted(func):
+                # Compiled functions use the compiled kernel, which doesn't need the array of midpoints
+                results.append(_midpoint_kernel(float(self.a[0]), division_width, n, func))
+                continue
+            if midpoints is None:
+                # The midpoints are the same for every function, so they are only calculated once
+                midpoints = self.a[0] + (np.arange(n) + 0.5) * division_width
+            results.append(division_width * np.sum(_evaluate(func, midpoints.shape, midpoints)))
+        return results
 
     def composite_midpoint_adaptive(self, e, limit=5000):
         """
@@ -101,30 +239,70 @@ class Integral:
         -------
         The estimate for the integral.
         """
-        def recursive_integration(prev, n):
-            curr = self.composite_midpoint(n)
+        n = 1
+        prev = self.composite_midpoint(n)
+        while True:
+            # Tripling the subdivisions keeps each previous midpoint as the midpoint of a new subdivision,
+            # so only the 2n new midpoints either side of them need to be evaluated.
+            division_width = self.width / (3 * n)
+            left_points = self.a[0] + (3 * np.arange(n) + 0.5) * division_width
+            new_points = np.concatenate((left_points, left_points + 2 * division_width))
+            curr = prev / 3 + division_width * np.sum(_evaluate(self.func, new_points.shape, new_points))
+            n *= 3
             if abs(prev - curr) / curr < e or n > limit:
                 return curr, n
-            return recursive_integration(curr, n*2)
-        result = recursive_integration(self.composite_midpoint(1), 2)
-        return result
+            prev = curr
+
+    def romberg(self, e, levels=20):
+        """
+        Uses Romberg integration (Richardson extrapolation of the trapezoidal rule) to reach the desired precision.
+        Parameters
+        ----------
+        e : float
+            The relative error tolerance, indicating when to end the integration
+        levels : int
+            (Optional) The maximum number of rows of the Romberg tableau before the procedure terminates.
+
+        Returns
+        -------
+        The estimate for the integral and the number of subdivisions used.
+        """
+        n = 1
+        # The first row of the tableau is the trapezoidal rule using a single subdivision
+        prev_row = [self.width / 2 * (self.func(self.a[0]) + self.func(self.b[0]))]
+        for level in range(1, levels):
+            # Halving the division width keeps the previous points, so only the n new midpoints are evaluated
+            row = [(prev_row[0] + self.composite_midpoint(n)) / 2]
+            n *= 2
+            for m in range(1, level + 1):
+                row.append(row[m - 1] + (row[m - 1] - prev_row[m - 1]) / (4**m - 1))
+            if abs(row[level] - prev_row[level - 1]) / abs(row[level]) < e:
+                return row[level], n
+            prev_row = row
+        return prev_row[-1], n
 
     def _establish_grid(self, n):
         """
         A method used by n-dimensional integration methods to set up the n-dimensional grid.
         """
         dimension_number = len(self.a)  # finds number of dimensions of function
-        div_widths = []
-        start_points = []
-        end_points = []
         # find division width for each dimension
-        for i in range(dimension_number):
-            div_width = (self.b[i] - self.a[i]) / n
-            div_widths.append(div_width)
-            start_points.append(self.a[i] + div_width / 2)
-            end_points.append(self.b[i] - div_width / 2)
-        volume = np.prod(div_widths)  # 'volume' of each division element is used in the integral calculation
-        return div_widths, volume, start_points, end_points, dimension_number
+        div_widths = tuple((self.b[i] - self.a[i]) / n for i in range(dimension_number))
+        # 'volume' of each division element is used in the integral calculation. There are only a few dimensions,
+        # so a plain Python product avoids the overhead of calling NumPy.
+        volume = math.prod(div_widths)
+        return div_widths, volume, dimension_number
+
+    def _evaluate_grid(self, points, div_widths, offset):
+        """
+        A method used by n-dimensional integration methods to evaluate the function on a grid with the given number of
+        points in each dimension. The offset gives the position of the first point in each dimension as a fraction of
+        the division width.
+        """
+        coords = [self.a[i] + (np.arange(points) + offset) * div_widths[i] for i in range(len(div_widths))]
+        # The sparse grids broadcast against each other, so the function is evaluated over the whole grid in one call
+        shape = (points,) * len(div_widths)
+        return _evaluate(self.func, shape, *np.meshgrid(*coords, indexing='ij', sparse=True))
 
     def composite_midpoint_n_dim(self, n):
         """
@@ -138,24 +316,11 @@ class Integral:
         -------
         Estimate for the integral
         """
-        div_widths, volume, start_points, end_points, dimension_number = self._establish_grid(n)
-        current_point = start_points.copy()
-        d = 0  # label for the dimension
-        integrals = []
-        while True:
-            # The div_widths[d]/2 term is to mitigate rounding errors.
-            while current_point[d] + div_widths[d] >= end_points[d] + div_widths[d]/2:
-                d += 1
-                if d == dimension_number:
-                    integrals.append(volume * self.func(*current_point))
-                    total_integral = sum(integrals)
-                    return total_integral
-            integrals.append(volume * self.func(*current_point))
-            current_point[d] += div_widths[d]
-            for i in range(0, d):
-                # This is to reset the current point to the start of next 'row'.
-                current_point[i] = start_points[i]
-            d = 0
+        div_widths, volume, dimension_number = self._establish_grid(n)
+        if jitted(self.func):
+            kernel = _grid_kernel(dimension_number)
+            return volume * kernel(np.asarray(self.a, dtype=float), np.array(div_widths), n, 0.5, np.ones(n), self.func)
+        return volume * np.sum(self._evaluate_grid(n, div_widths, 0.5))
 
     def simpsons(self, n=1):
         """
@@ -170,20 +335,16 @@ class Integral:
         Estimate for the integral
         """
         division_width = (self.b[0] - self.a[0])/n
+        if jitted(self.func):
+            return _simpsons_kernel(float(self.a[0]), division_width, n, self.func)
         coefficient = division_width / 6
-        total_integral = 0
-        left = self.a[0]
-        term_1 = self.func(left)
-        for i in range(0, n):
-            right = left + division_width
-            term_3 = self.func(right)
-            term_2 = 4 * self.func((left + right) / 2)
-            integral = coefficient * (term_1 + term_2 + term_3)
-            total_integral += integral
-            left = right
-            term_1 = term_3
-        result = total_integral
-        return result
+        # bounds and midpoints of every subdivision, each evaluated in a single call to the function
+        bounds = self.a[0] + np.arange(n + 1) * division_width
+        midpoints = self.a[0] + (np.arange(n) + 0.5) * division_width
+        f_bounds = _evaluate(self.func, bounds.shape, bounds)
+        f_midpoints = _evaluate(self.func, midpoints.shape, midpoints)
+        # inner bounds are shared by two neighbouring subdivisions so are counted twice
+        return coefficient * (f_bounds[0] + f_bounds[-1] + 2 * np.sum(f_bounds[1:-1]) + 4 * np.sum(f_midpoints))
 
     def _simpsons(self, a, fa, b, fb):
         """
@@ -194,21 +355,6 @@ class Integral:
         res = abs(b - a) / 6 * (fa + 4 * fm + fb)
         return m, fm, res
 
-    def _simpsons_adaptive_eff(self, a, fa, b, fb, prev, e, m, fm):
-        """
-        Recursive function for the adaptive Simpson's method.
-        """
-        # evaluate simpsons for the left subdivision, saving lm & flm for reuse
-        lm, flm, left = self._simpsons(a, fa, m, fm)
-        # evaluate simpsons for right subdivision, saving rm & frm for reuse
-        rm, frm, right = self._simpsons(m, fm, b, fb)
-        self.simps_sub_div += 1  # One division becomes two subdivisions.
-
-        if abs(left + right - prev) / (left + right) < e:
-            return left + right
-        return (self._simpsons_adaptive_eff(a, fa, m, fm, left, e, lm, flm) +
-                self._simpsons_adaptive_eff(m, fm, b, fb, right, e, rm, frm))
-
     def simpsons_adaptive(self, e):
         """
         Adaptively uses Simpsons to estimate the integral with a desired precision efficiently.
@@ -224,7 +370,25 @@ class Integral:
         fa, fb = self.func(a), self.func(b)
         m, fm, res = self._simpsons(a=a, fa=fa, fb=fb, b=b)
         self.simps_sub_div = 1
-        return self._simpsons_adaptive_eff(a, fa, b, fb, res, e, m, fm), self.simps_sub_div
+        total = 0
+        # Divisions still to be checked, with their bounds, midpoint, function evaluations and Simpson's estimate.
+        # Carrying the evaluations with each division means every point in the tree is evaluated exactly once.
+        divisions = [(a, fa, b, fb, m, fm, res)]
+        while divisions:
+            a, fa, b, fb, m, fm, prev = divisions.pop()
+            # evaluate simpsons for the left subdivision, saving lm & flm for reuse
+            lm, flm, left = self._simpsons(a, fa, m, fm)
+            # evaluate simpsons for right subdivision, saving rm & frm for reuse
+            rm, frm, right = self._simpsons(m, fm, b, fb)
+            self.simps_sub_div += 1  # One division becomes two subdivisions.
+
+            if abs(left + right - prev) / (left + right) < e:
+                total += left + right
+            else:
+                # The left subdivision is pushed last so it is checked first
+                divisions.append((m, fm, b, fb, rm, frm, right))
+                divisions.append((a, fa, m, fm, lm, flm, left))
+        return total, self.simps_sub_div
 
     def simpsons_adaptive_ineff(self, cut_off=10**-6, limit=5000):
         """
@@ -249,36 +413,43 @@ class Integral:
         -------
         Estimate for the integral
         """
-        div_widths, volume, start_points, end_points, dimension_number = self._establish_grid(n)
-        coefficient = volume/6
-        a_start_points = []
-        b_start_points = []
-        for i in range(dimension_number):
-            a_start_points.append(self.a[i])
-            b_start_points.append(self.a[i] + div_widths[i])
-        current_point = start_points.copy()
-        current_a = a_start_points.copy()
-        current_b = b_start_points.copy()
-        integrals = []
-        d = 0
-        while True:
-            while current_point[d] + div_widths[d] >= end_points[d] + div_widths[d]/2:
-                d += 1
-                if d == dimension_number:
-                    res = coefficient * (self.func(*current_a) + 4 * self.func(*current_point) + self.func(*current_b))
-                    integrals.append(res)
-                    total_integral = sum(integrals)
-                    return total_integral
-            integrals.append(
-                coefficient * (self.func(*current_a) + 4 * self.func(*current_point) + self.func(*current_b)))
-            current_point[d] += div_widths[d]
-            current_a[d] += div_widths[d]
-            current_b[d] += div_widths[d]
-            for i in range(d):
-                current_point[i] = start_points[i]
-                current_a[i] = a_start_points[i]
-                current_b[i] = b_start_points[i]
-            d = 0
+        div_widths, volume, dimension_number = self._establish_grid(n)
+        # In each dimension the bounds and midpoints of the divisions give 2n+1 points, weighted by the 1D Simpson's rule.
+        # Inner bounds are shared by two neighbouring divisions so are counted twice.
+        weights = np.ones(2 * n + 1)
+        weights[1:-1:2] = 4
+        weights[2:-1:2] = 2
+        half_widths = tuple(div_width / 2 for div_width in div_widths)
+        if jitted(self.func):
+            kernel = _grid_kernel(dimension_number)
+            total = kernel(np.asarray(self.a, dtype=float), np.array(half_widths), 2 * n + 1, 0, weights, self.func)
+            return volume / 6**dimension_number * total
+        values = self._evaluate_grid(2 * n + 1, half_widths, 0)
+        # Contract the 1D weights against one axis of the values at a time, so the tensor product of weights is never
+        # stored and each step only reduces the size of the remaining array.
+        total = values
+        for _ in range(dimension_number):
+            total = total @ weights
+        return volume / 6**dimension_number * total
+
+    def gauss_legendre(self, k):
+        """
+        Estimates integral using Gauss-Legendre quadrature.
+        Parameters
+        ----------
+        k : int
+            Number of nodes. The estimate is exact for polynomials of degree 2k-1 and below.
+        Returns
+        -------
+        Estimate for the integral
+        """
+        if k not in Integral._legendre_nodes:
+            Integral._legendre_nodes[k] = np.polynomial.legendre.leggauss(k)
+        nodes, weights = Integral._legendre_nodes[k]
+        # scale the nodes from [-1, 1] to the bounds of the integral
+        half_width = (self.b[0] - self.a[0]) / 2
+        centre = (self.a[0] + self.b[0]) / 2
+        return half_width * (weights @ _evaluate(self.func, nodes.shape, centre + half_width * nodes))
 
     def monte_carlo(self, n=1000):
         """
@@ -291,12 +462,11 @@ class Integral:
         -------
         Estimate for the integral
         """
-        random_func_values = []
-        for i in range(0, n):
-            # Use random uniform to generate a random x and evaluate the function at that x
-            random_x = random.uniform(self.a[0], self.b[0])
-            random_func_values.append(self.func(random_x))
-        mean = sum(random_func_values)/len(random_func_values)
+        if jitted(self.func):
+            return _monte_carlo_kernel(float(self.a[0]), float(self.b[0]), n, self.func)
+        # Generate all the random x values at once and evaluate the function at them in a single call
+        random_x = np.random.uniform(self.a[0], self.b[0], size=n)
+        mean = np.mean(_evaluate(self.func, random_x.shape, random_x))
         integral = mean * (self.b[0] - self.a[0])
         return integral
 
@@ -311,17 +481,49 @@ class Integral:
         -------
         Estimate for the integral.
         """
-        dimension_widths = []
         dimension_number = len(self.a)
-        for i in range(dimension_number):
-            dimension_width = self.b[i] - self.a[i]
-            dimension_widths.append(dimension_width)
-        widths_product = np.prod(dimension_widths)
-        rand_func_vals = []
-        for i in range(n):
-            coords = []
-            for j in range(dimension_number):
-                coords.append(random.uniform(self.a[j], self.b[j]))
-            rand_func_vals.append(self.func(*coords))
-        mean = sum(rand_func_vals) / n
+        widths_product = math.prod(self.b[i] - self.a[i] for i in range(dimension_number))
+        if jitted(self.func):
+            kernel = _monte_carlo_n_dim_kernel(dimension_number)
+            widths = np.subtract(self.b, self.a, dtype=float)
+            return kernel(np.asarray(self.a, dtype=float), widths, n, self.func) * widths_product
+        # Each row holds the random values for one dimension, so the values passed for each argument are contiguous
+        lower = np.reshape(self.a, (dimension_number, 1))
+        upper = np.reshape(self.b, (dimension_number, 1))
+        random_coords = np.random.uniform(lower, upper, size=(dimension_number, n))
+        mean = np.mean(_evaluate(self.func, (n,), *random_coords))
+        return mean * widths_product
+
+    def quasi_monte_carlo(self, n=1000):
+        """
+        Estimates integral using the quasi-Monte Carlo method.
+        Parameters
+        ----------
+        n : int
+            Number of samples
+        Returns
+        -------
+        Estimate for the integral
+        """
+        # A scrambled Halton sequence covers the range more evenly than random samples, for any number of samples
+        sample_x = qmc.scale(qmc.Halton(d=1).random(n), self.a[0], self.b[0])[:, 0]
+        mean = np.mean(_evaluate(self.func, sample_x.shape, sample_x))
+        return mean * (self.b[0] - self.a[0])
+
+    def quasi_monte_carlo_n_dim(self, n):
+        """
+        Quasi-Monte Carlo method generalised to n dimensions.
+        Parameters
+        ----------
+        n : int
+            Number of samples
+        Returns
+        -------
+        Estimate for the integral.
+        """
+        dimension_number = len(self.a)
+        widths_product = math.prod(self.b[i] - self.a[i] for i in range(dimension_number))
+        # Each row is a point of the low discrepancy sequence, so each column holds the values for one dimension
+        sample_points = qmc.scale(qmc.Halton(d=dimension_number).random(n), self.a, self.b)
+        mean = np.mean(_evaluate(self.func, (n,), *sample_points.T))
         return mean * widths_product
@@ -0,0 +1,29 @@
+try:
+    import numba
+    from numba.extending import is_jitted
+    prange = numba.prange
+except ImportError:  # Numba is optional, without it the NumPy implementations are used
+    numba = None
+    prange = range
+
+
+def jit(func=None, parallel=False, cache=True):
+    """
+    Compiles a function with Numba if it is installed, otherwise the function is returned unchanged.
+    Compiled code is cached to disk so the compilation overhead is only paid on the first run. Use cache=False for
+    functions generated at runtime, which have no source file to cache against, and for kernels that take a compiled
+    function as an argument, whose cache entries are tied to that function object and so are never reused.
+    Can be used as @jit, or as @jit(parallel=True) to let loops over prange run on multiple threads.
+    """
+    if func is None:
+        return lambda f: jit(f, parallel=parallel, cache=cache)
+    if numba is None:
+        return func
+    return numba.njit(cache=cache, parallel=parallel)(func)
+
+
+def jitted(func):
+    """
+    Checks whether a function has been compiled with Numba, and so can be called from inside a compiled kernel.
+    """
+    return numba is not None and is_jitted(func)
@@ -1,12 +1,11 @@
 import numpy as np
 import matplotlib.pyplot as plt
-import scipy.integrate as integrate
 # Imports from the other files
 from integral import Integral
 from one_dim_functions import func_list_1d, func_str_list_1d
 from n_dim_functions import func_list_nd, func_desc_nd
 from time_tests import time_div_dependence, time_test
-from accuracy_test import error_div_dependence, error_div_dependence_nd
+from accuracy_test import error_div_dependence, error_div_dependence_nd, reference_value
 
 
 #############
@@ -61,10 +60,10 @@ func_nums = [
 # 1D composite midpoint and Simpson's rule:
 figures_1d_time_test = []
 for i in func_nums[0]:
-    cm_durations = time_div_dependence(integrator_method=integrators_1d[i].composite_midpoint, division_nums=divs, repeats=100,
+    cm_durations = time_div_dependence(integrator_method=integrators_1d[i].composite_midpoint, division_nums=divs, repeats=1,
                                        plot=False)
     simpsons_durations = time_div_dependence(integrator_method=integrators_1d[i].simpsons, division_nums=divs,
-                                             repeats=100, plot=False)
+                                             repeats=1, plot=False)
 
     fig_1d = plt.figure()
     plt.plot(divs, cm_durations, label="Composite Midpoint")
@@ -125,9 +124,11 @@ figs_acc = []
 for i in func_nums[4]:
     cm_error = error_div_dependence(integrators_1d[i], integrators_1d[i].composite_midpoint, divs_acc, plot=False)
     sim_error = error_div_dependence(integrators_1d[i], integrators_1d[i].simpsons, divs_acc, plot=False)
+    gl_error = error_div_dependence(integrators_1d[i], integrators_1d[i].gauss_legendre, divs_acc, plot=False)
     fig = plt.figure()
     plt.plot(divs_acc, cm_error, label='Composite Midpoint')
     plt.plot(divs_acc, sim_error, label='Simpsons')
+    plt.plot(divs_acc, gl_error, label='Gauss-Legendre (number of nodes)')
     plt.legend()
     plt.xlabel('Number of Subdivisions')
     plt.ylabel('Fractional Error')
@@ -152,8 +153,11 @@ mc_fig_list_error_nd = []
 for i in func_nums[6]:
     mc_errors = error_div_dependence_nd(integrator=integrators_nd[i], integrator_method=integrators_nd[i].monte_carlo_n_dim,
                                         divs=samples, plot=False)
+    qmc_errors = error_div_dependence_nd(integrator=integrators_nd[i],
+                                         integrator_method=integrators_nd[i].quasi_monte_carlo_n_dim, divs=samples, plot=False)
     fig = plt.figure()
     plt.plot(samples, mc_errors, label="Monte Carlo")
+    plt.plot(samples, qmc_errors, label="Quasi-Monte Carlo")
     plt.legend()
     plt.xlabel('Number of Samples')
     plt.ylabel('Fractional error')
@@ -166,16 +170,19 @@ for i in func_nums[6]:
 
 print("Testing adaptive methods")
 for i in func_nums[7]:
-    # Check result using scipy.integrate.quad. Function and lower and upper bounds are given by the instance attributes.
+    # Check result using scipy.integrate.quad. The reference values are cached, so this reuses the error tests' results.
     simpsons_test = time_test(integrators_1d[i].simpsons_adaptive, 0.01)
     midpoint_test = time_test(integrators_1d[i].composite_midpoint_adaptive, 0.01)
+    romberg_test = time_test(integrators_1d[i].romberg, 0.01)
     print(
         "\nfunction: ", func_str_list_1d[i],
-        "\nExpected Result: ", integrate.quad(integrators_1d[i].func, integrators_1d[i].a[0], integrators_1d[i].b[0])[0],
+        "\nExpected Result: ", reference_value(integrators_1d[i]),
         "\nAdaptive Simpsons using an error threshold of 1%:",
         "\nResult: ", simpsons_test[1][0], "Completion time: ", simpsons_test[0], "Subdivisions: ", simpsons_test[1][1],
         "\nAdaptive Composite Midpoint using an error threshold of 1%:",
         "\nResult: ", midpoint_test[1][0], "Completion time: ", midpoint_test[0], "Subdivisions: ", midpoint_test[1][1],
+        "\nRomberg using an error threshold of 1%:",
+        "\nResult: ", romberg_test[1][0], "Completion time: ", romberg_test[0], "Subdivisions: ", romberg_test[1][1],
           )
 
 # Plot all the results
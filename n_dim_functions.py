@@ -1,27 +1,38 @@
 import numpy as np
+from jit import jit
 
 
-# 1d Test functions
+# nd Test functions
+@jit
 def func_2d_1(x, y):
-    return (x + y) ** 2
+    s = x + y
+    return s * s
 
 
+@jit
 def func_3d_1(x, y, z):
-    return (x + y + z) ** 2
+    s = x + y + z
+    return s * s
 
 
+@jit
 def func_4d_1(x, y, z, q):
-    return (x + y + z + q) ** 2
+    s = x + y + z + q
+    return s * s
 
 
+@jit
 def func_5d_1(x, y, z, q, r):
-    return (x + y + z + q + r) ** 2
+    s = x + y + z + q + r
+    return s * s
 
 
+@jit
 def func_2d_2(x, y):
     return np.sin(x + y)
 
 
+@jit
 def func_2d_3(x, y):
     return np.exp(x + y)
 
@@ -1,27 +1,36 @@
 import numpy as np
+from jit import jit
 
 
 # 1d Test functions
+@jit
 def func_1d_1(x):
-    return x ** 2
+    return x * x
 
 
+@jit
 def func_1d_2(x):
-    return x ** 3 / 10**3
+    return x * x * x / 10**3
 
 
+@jit
 def func_1d_3(x):
-    return x ** 4 / 10**4
+    x2 = x * x
+    return x2 * x2 / 10**4
 
 
+@jit
 def func_1d_4(x):
-    return x ** 5 / 10**5
+    x2 = x * x
+    return x2 * x2 * x / 10**5
 
 
+@jit
 def func_1d_5(x):
     return np.sin(x)
 
 
+@jit
 def func_1d_6(x):
     return np.exp(x)
 
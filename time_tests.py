@@ -1,9 +1,12 @@
 import matplotlib.pyplot as plt
-import time
+import timeit
+
+# Approximate time in seconds spent measuring each point of a time_div_dependence test
+POINT_TIME = 0.01
 
 
 # Functions to demonstrate time performance
-def time_test(integrator_method, *method_params):
+def time_test(integrator_method, *method_params, number=None):
     """
     Function to measure completion time of an integrator method.
 
@@ -13,16 +16,25 @@ def time_test(integrator_method, *method_params):
         Use instance.method for an instance of the integrator class and the desired method.
     method_params:
         Parameters required by the method (if any).
+    number:
+        (Optional) How many calls to average the completion time over. If not given, timeit's autorange chooses
+        enough calls to measure reliably.
 
     Returns
     -------
     A tuple of the completion time in seconds and the integral result.
 
     """
-    start = time.perf_counter()
+    # The first call also acts as a warm up, so compiling the method or function is not included in the timing.
     result = integrator_method(*method_params)
-    stop = time.perf_counter()
-    return stop - start, result
+    # The method is repeated with garbage collection disabled, and the completion time is the average over the repeats.
+    timer = timeit.Timer(lambda: integrator_method(*method_params))
+    if number is None:
+        # autorange repeats the method until the total time is long enough to measure reliably
+        number, total_time = timer.autorange()
+    else:
+        total_time = timer.timeit(number)
+    return total_time / number, result
 
 
 # integrator_class, func, x_min, x_max,
@@ -40,7 +52,8 @@ def time_div_dependence(integrator_method, division_nums, repeats=1, plot=False)
     division_nums:
         Array of the subdivision numbers to measure completion time with.
     repeats
-        How many times the time test repeats for each subdivision.
+        How many times the time test repeats for each subdivision. Each time test already averages over many
+        calls, so this is only needed to smooth out variation between time tests.
     plot:
         True/False. Choose whether to produce a plot of the results.
 
@@ -48,12 +61,17 @@ def time_div_dependence(integrator_method, division_nums, repeats=1, plot=False)
     -------
     Array of the completion times.
     """
+    # autorange is only used once, on the largest subdivision number, to choose how many calls each time test averages
+    # over. Each time test then takes at most about POINT_TIME seconds, rather than autorange's 0.2 seconds.
+    largest = max(division_nums)
+    call_time = time_test(integrator_method, largest)[0]
+    number = max(1, int(POINT_TIME / call_time))
     durations = []
     for n in division_nums:
-        temp_durations = []
+        total_duration = 0
         for _ in range(repeats):
-            temp_durations.append(time_test(integrator_method, n)[0])
-        mean_duration = sum(temp_durations) / repeats
+            total_duration += time_test(integrator_method, n, number=number)[0]
+        mean_duration = total_duration / repeats
         durations.append(mean_duration)
         # durations.append(time_test(integrator_method, n)[0])
     if plot: